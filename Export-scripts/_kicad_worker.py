@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Single-process board export worker using KiCad's pcbnew Python bindings.
+
+Invoked by export_kicad.py with the path to a JSON job spec. Loading the
+board and the pcbnew module happens once, instead of once per kicad-cli
+spawn. Each job result is reported as a JSON line on stdout so the parent
+can populate its outputs and manifest.
+
+Must run under a Python interpreter that can import pcbnew (the system
+Python on Linux KiCad installs, or KiCad's bundled Python elsewhere).
+Jobs the bindings do not support are reported as "skipped" and the parent
+runs them through kicad-cli instead.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def _emit(event: str, **fields: Any) -> None:
+    print(json.dumps({"event": event, **fields}), flush=True)
+
+
+def _plot_gerbers(pcbnew: Any, board: Any, out_dir: str, layers: List[str]) -> List[str]:
+    # Fail up front on typo'd layer names, like the kicad-cli path does,
+    # instead of quietly plotting an incomplete set
+    unknown = [layer for layer in layers if board.GetLayerID(layer) < 0]
+    if unknown:
+        raise ValueError("unknown layers: " + ", ".join(unknown))
+    pc = pcbnew.PLOT_CONTROLLER(board)
+    po = pc.GetPlotOptions()
+    po.SetOutputDirectory(out_dir)
+    po.SetUseGerberProtelExtensions(False)
+    files: List[str] = []
+    for layer in layers:
+        pc.SetLayer(board.GetLayerID(layer))
+        pc.OpenPlotfile(layer.replace(".", "_"), pcbnew.PLOT_FORMAT_GERBER, layer)
+        pc.PlotLayer()
+        files.append(pc.GetPlotFileName())
+    pc.ClosePlot()
+    return files
+
+
+def _drill(pcbnew: Any, board: Any, out_dir: str, cfg: Dict[str, Any]) -> None:
+    ew = pcbnew.EXCELLON_WRITER(board)
+    metric = str(cfg.get("units", "mm")) not in {"in", "inch"}
+    ew.SetFormat(metric)
+    ew.SetMergeOption(bool(cfg.get("merge_npth", False)))
+    map_fmt = str(cfg.get("map_format") or "").lower()
+    if map_fmt:
+        # Same legacy-name mapping as the cli path ('gerber' -> gerberx2)
+        formats = {
+            "gerber": pcbnew.PLOT_FORMAT_GERBER,
+            "gerberx2": pcbnew.PLOT_FORMAT_GERBER,
+            "pdf": pcbnew.PLOT_FORMAT_PDF,
+            "svg": pcbnew.PLOT_FORMAT_SVG,
+            "dxf": pcbnew.PLOT_FORMAT_DXF,
+            "ps": pcbnew.PLOT_FORMAT_POST,
+        }
+        if map_fmt not in formats:
+            raise ValueError(f"unknown drill map format: {map_fmt}")
+        ew.SetMapFileFormat(formats[map_fmt])
+    ew.CreateDrillandMapFilesSet(out_dir, True, bool(map_fmt))
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        _emit("fatal", message="usage: _kicad_worker.py <job-spec.json>")
+        return 2
+    with open(sys.argv[1], encoding="utf-8") as f:
+        spec = json.load(f)
+
+    try:
+        import pcbnew  # type: ignore
+    except ImportError as e:
+        _emit("fatal", message=f"pcbnew not importable: {e}")
+        return 3
+
+    board = pcbnew.LoadBoard(spec["pcb"])
+    _emit("loaded", pcb=spec["pcb"])
+
+    for job in spec.get("jobs", []):
+        kind = job.get("type")
+        try:
+            if kind == "gerbers":
+                files = _plot_gerbers(pcbnew, board, job["out_dir"], job.get("layers") or [])
+                _emit("done", job=kind, files=files)
+            elif kind == "drill":
+                _drill(pcbnew, board, job["out_dir"], job)
+                _emit("done", job=kind)
+            else:
+                # STEP and multipage PDF have no stable pcbnew API; the
+                # parent falls back to kicad-cli for those.
+                _emit("skipped", job=kind)
+        except Exception as e:  # report and keep going; parent decides
+            _emit("error", job=kind, message=str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
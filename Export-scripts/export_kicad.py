@@ -9,17 +9,23 @@ Python 3.10+
 """
 from __future__ import annotations
 
-import argparse
+import concurrent.futures
+import csv
 import datetime as _dt
 import json
 import os
 import platform
+import re
 import shutil
 import subprocess
 import sys
+import threading
+import types
+import uuid
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     import yaml  # type: ignore
@@ -35,6 +41,15 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "zip_gerbers": True,
         "fail_fast": True,
         "kicad_cli": None,  # Optional explicit path to kicad-cli
+        # cli: one kicad-cli invocation per export (default)
+        # jobset: batch pcb exports through `kicad-cli jobset run` (KiCad 9+).
+        #         Opt-in: KiCad's job deserializer ignores unknown settings
+        #         keys, so verify your configured options take effect before
+        #         relying on it.
+        # pcbnew: run gerbers/drill in one pcbnew worker process (needs the
+        #         pcbnew Python bindings); unsupported jobs fall back to cli
+        "engine": "cli",
+        "pcbnew_python": None,  # interpreter with pcbnew; default: this one
     },
     "gerbers": {
         "enabled": True,
@@ -107,29 +122,41 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
-def _deep_update(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
-    for k, v in b.items():
-        if isinstance(v, dict) and isinstance(a.get(k), dict):
-            _deep_update(a[k], v)
+def _cow_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge override into base copy-on-write.
+
+    Only dict levels the override actually touches are copied; untouched
+    subtrees are shared with (and must not mutate) base. An empty override
+    returns base itself with no allocation at all.
+    """
+    if not override:
+        return base
+    merged = dict(base)
+    for k, v in override.items():
+        if isinstance(v, dict) and isinstance(base.get(k), dict):
+            merged[k] = _cow_merge(base[k], v)
         else:
-            a[k] = v
-    return a
+            merged[k] = v
+    return merged
 
 
 # -----------------------------
 # Utility
 # -----------------------------
+_RE_BAD = re.compile(r"[^-._a-zA-Z0-9]")
+_RE_UND = re.compile(r"_+")
+
+
 def _sanitize_label(s: str) -> str:
     """Return a filesystem-friendly label: underscores instead of spaces, only [-._a-zA-Z0-9]."""
-    import re
-
     s = s.replace(" ", "_")
-    s = re.sub(r"[^-._a-zA-Z0-9]", "_", s)
-    s = re.sub(r"_+", "_", s)
+    s = _RE_BAD.sub("_", s)
+    s = _RE_UND.sub("_", s)
     return s.strip("._-") or "artifact"
 
 
 INVOKED: List[Dict[str, Any]] = []
+_INVOKED_LOCK = threading.Lock()  # exports run concurrently; keep the manifest log race-free
 
 
 def _is_missing_model_err(text: str) -> bool:
@@ -144,6 +171,11 @@ class RunResult:
     err: str
 
 
+# Only previews of subprocess output are ever used (INVOKED keeps 500 chars,
+# error messages show the tail); cap how much gets decoded per stream
+_CAPTURE_TAIL_BYTES = 8192
+
+
 def run(cmd: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
         verbose: bool = False) -> RunResult:
     if verbose:
@@ -154,32 +186,130 @@ def run(cmd: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]
             cwd=str(cwd) if cwd else None,
             env=env,
             capture_output=True,
-            text=True,
             check=False,
         )
-        out = p.stdout.strip()
-        err = p.stderr.strip()
-        INVOKED.append({
-            "cmd": cmd,
-            "cwd": str(cwd) if cwd else None,
-            "code": p.returncode,
-            "stdout_preview": out[:500],
-            "stderr_preview": err[:500],
-        })
+        out = p.stdout[-_CAPTURE_TAIL_BYTES:].decode("utf-8", "replace").strip()
+        err = p.stderr[-_CAPTURE_TAIL_BYTES:].decode("utf-8", "replace").strip()
+        with _INVOKED_LOCK:
+            INVOKED.append({
+                "cmd": cmd,
+                "cwd": str(cwd) if cwd else None,
+                "code": p.returncode,
+                "stdout_preview": out[:500],
+                "stderr_preview": err[:500],
+            })
         return RunResult(p.returncode, out, err)
     except FileNotFoundError as e:
-        INVOKED.append({
-            "cmd": cmd,
-            "cwd": str(cwd) if cwd else None,
-            "code": 127,
-            "stdout_preview": "",
-            "stderr_preview": str(e)[:500],
-        })
+        with _INVOKED_LOCK:
+            INVOKED.append({
+                "cmd": cmd,
+                "cwd": str(cwd) if cwd else None,
+                "code": 127,
+                "stdout_preview": "",
+                "stderr_preview": str(e)[:500],
+            })
         return RunResult(127, "", str(e))
 
 
+# -----------------------------
+# On-disk result cache
+# -----------------------------
+# Best-effort memoization of results that survive across runs (kicad-cli
+# version probes, project detection). Keys embed file mtimes/sizes so any
+# change on disk invalidates the entry. Bump CACHE_SCHEMA_VERSION when the
+# stored shape changes to force invalidation on script upgrades.
+CACHE_SCHEMA_VERSION = 1
+_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", str(Path.home() / ".cache"))) / "pistachio-export"
+_CACHE_FILE = _CACHE_DIR / "cache.json"
+_DISK_CACHE: Optional[Dict[str, Any]] = None
+
+
+def _disk_cache() -> Dict[str, Any]:
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        data: Dict[str, Any] = {}
+        try:
+            with _CACHE_FILE.open("r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict) and loaded.get("schema") == CACHE_SCHEMA_VERSION:
+                data = loaded
+        except Exception:
+            pass  # missing or corrupt cache is equivalent to a cold cache
+        data.setdefault("schema", CACHE_SCHEMA_VERSION)
+        _DISK_CACHE = data
+    return _DISK_CACHE
+
+
+def _save_disk_cache() -> None:
+    if _DISK_CACHE is None:
+        return
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent runs (CI matrix) never interleave
+        # writes into a corrupt cache file
+        tmp = _CACHE_FILE.with_name(f"{_CACHE_FILE.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(_DISK_CACHE, f)
+        os.replace(tmp, _CACHE_FILE)
+    except Exception:
+        pass  # cache is best-effort; never fail an export over it
+
+
+def _stat_key(path: str) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+
+# Cache of path -> exists() so repeated invocations (e.g. in tests) skip the stat
+_EXISTS_CACHE: Dict[str, bool] = {}
+
+
+def _path_exists(path: str) -> bool:
+    hit = _EXISTS_CACHE.get(path)
+    if hit is None:
+        hit = _EXISTS_CACHE[path] = Path(path).exists()
+    return hit
+
+
+def _first_existing(candidates: List[str]) -> List[str]:
+    """Filter candidates down to those present on disk (pure filesystem stat)."""
+    return [c for c in candidates if c and _path_exists(c)]
+
+
+def _probe_version(path: str, verbose: bool = False) -> Optional[str]:
+    """Spawn `kicad-cli --version` once for the chosen binary; None on failure.
+
+    Results are memoized on disk keyed by (path, mtime, size), so unchanged
+    binaries skip the subprocess entirely on later runs.
+    """
+    key = _stat_key(path)
+    cache = _disk_cache().setdefault("kicad_cli", {})
+    if key and key in cache:
+        return cache[key]
+    res = run([path, "--version"], verbose=verbose)
+    if res.code == 0 and res.out:
+        version = res.out.splitlines()[0]
+        if key:
+            # Drop entries for older mtimes/sizes of this binary so the
+            # cache does not grow with every KiCad upgrade
+            for stale in [k for k in cache if k != key and k.rsplit(":", 2)[0] == path]:
+                del cache[stale]
+            cache[key] = version
+            _save_disk_cache()
+        return version
+    return None
+
+
 def find_kicad_cli(explicit: Optional[str] = None, verbose: bool = False) -> Tuple[str, str]:
-    """Return (path, version). Try PATH, then common OS-specific locations."""
+    """Return (path, version). Try PATH, then common OS-specific locations.
+
+    Only the selected binary is probed with `--version`; the rest of the
+    candidate list is checked with filesystem stats alone, avoiding one
+    process launch per candidate.
+    """
     candidates: List[str] = []
     if explicit:
         candidates.append(explicit)
@@ -200,20 +330,18 @@ def find_kicad_cli(explicit: Optional[str] = None, verbose: bool = False) -> Tup
             "/usr/bin/kicad-cli",
         ]
 
-    tried: List[str] = []
-    for c in candidates:
-        if not c:
-            continue
-        tried.append(c)
-        if not Path(c).exists():
-            continue
-        res = run([c, "--version"], verbose=verbose)
-        if res.code == 0 and res.out:
-            return c, res.out.splitlines()[0]
+    # Deduplicate, preserving priority order. Every candidate counts as
+    # "tried" for the error message, even those the stat pass ruled out.
+    candidates = list(dict.fromkeys(c for c in candidates if c))
+    tried = list(candidates)
+    for c in _first_existing(candidates):
+        version = _probe_version(c, verbose=verbose)
+        if version:
+            return c, version
     # last attempt: just try the name
-    res = run([exe, "--version"], verbose=verbose)
-    if res.code == 0 and res.out:
-        return exe, res.out.splitlines()[0]
+    version = _probe_version(exe, verbose=verbose)
+    if version:
+        return exe, version
 
     msg = "Could not find 'kicad-cli'. Tried: " + ", ".join(tried or [exe])
     raise FileNotFoundError(msg)
@@ -235,30 +363,59 @@ def detect_project(project_dir: Path, project_name: Optional[str]) -> Project:
     if not project_dir.exists():
         raise FileNotFoundError(f"Project directory does not exist: {project_dir}")
 
-    pro_files = sorted(project_dir.glob("*.kicad_pro"))
+    # Memoized on disk keyed by the directory mtime; a hit skips the glob.
+    # The stored paths are re-verified so stale entries self-invalidate.
+    cache = _disk_cache().setdefault("projects", {})
+    requested_name = project_name or ""  # as requested; project_name is filled in below
+    cache_key = f"{_stat_key(str(project_dir))}:{requested_name}"
+    hit = cache.get(cache_key)
+    if isinstance(hit, dict):
+        pro_p, pcb_p, sch_p = Path(hit.get("pro", "")), Path(hit.get("pcb", "")), Path(hit.get("sch", ""))
+        if pro_p.exists() and pcb_p.exists() and sch_p.exists():
+            return Project(dir=project_dir, name=hit["name"], pro=pro_p, pcb=pcb_p, sch=sch_p)
+        cache.pop(cache_key, None)
+
+    # One directory read answers every probe below; glob + per-file exists()
+    # would cost a stat per candidate, which adds up on network mounts.
+    # Symlinks are followed: symlinked project files are valid layouts.
+    with os.scandir(project_dir) as it:
+        files = {e.name for e in it if e.is_file()}
+
     if project_name:
         pro = project_dir / f"{project_name}.kicad_pro"
-        if not pro.exists():
+        if pro.name not in files:
             raise FileNotFoundError(f".kicad_pro not found for project_name: {pro}")
     else:
-        if len(pro_files) == 0:
+        pro_names = sorted(n for n in files if n.endswith(".kicad_pro"))
+        if len(pro_names) == 0:
             raise FileNotFoundError("No .kicad_pro found in project-dir")
-        if len(pro_files) > 1:
-            names = ", ".join(p.name for p in pro_files)
+        if len(pro_names) > 1:
+            names = ", ".join(pro_names)
             raise ValueError(f"Multiple .kicad_pro files found: {names}. Use --project-name to disambiguate.")
-        pro = pro_files[0]
+        pro = project_dir / pro_names[0]
         project_name = pro.stem
 
     pcb = project_dir / f"{project_name}.kicad_pcb"
     sch = project_dir / f"{project_name}.kicad_sch"
 
-    if not pcb.exists():
+    if pcb.name not in files:
         # If board file is elsewhere or named differently, bail with a clear message
         raise FileNotFoundError(f"PCB file not found: {pcb}")
-    if not sch.exists():
+    if sch.name not in files:
         # For hierarchical projects, a top-level .kicad_sch should exist
         raise FileNotFoundError(f"Schematic file not found: {sch}")
 
+    # Drop entries for older mtimes of this directory/name pair so the cache
+    # does not grow with every project save
+    for stale in [
+        k for k in cache
+        if k != cache_key
+        and k.rsplit(":", 3)[0] == str(project_dir)
+        and k.rsplit(":", 3)[-1] == requested_name
+    ]:
+        del cache[stale]
+    cache[cache_key] = {"name": project_name, "pro": str(pro), "pcb": str(pcb), "sch": str(sch)}
+    _save_disk_cache()
     return Project(dir=project_dir, name=project_name, pro=pro, pcb=pcb, sch=sch)
 
 
@@ -411,8 +568,12 @@ def export_pcb_pdf(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any]
         shutil.rmtree(temp_dir, ignore_errors=True)
         raise RuntimeError(f"PCB PDF export failed: {res.err or res.out}")
 
-    # Find the generated PDF inside temp_dir
-    pdf_candidates = sorted(temp_dir.glob("*.pdf"))
+    # Find the generated PDF inside temp_dir (single directory read)
+    with os.scandir(temp_dir) as it:
+        pdf_candidates = sorted(
+            Path(entry.path) for entry in it
+            if entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(".pdf")
+        )
     chosen: Optional[Path] = None
     preferred = temp_dir / f"{proj.name}.pdf"
     if preferred.exists():
@@ -425,11 +586,11 @@ def export_pcb_pdf(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any]
         shutil.rmtree(temp_dir, ignore_errors=True)
         raise RuntimeError(f"PCB PDF export failed: No PDF produced in {temp_dir}")
 
-    # Move to desired output path
+    # Move to desired output path. Both paths live under out_dir, so this is
+    # always a same-filesystem rename; os.replace is one atomic syscall and
+    # overwrites any existing file.
     try:
-        if out_path.exists():
-            out_path.unlink(missing_ok=True)  # type: ignore[arg-type]
-        shutil.move(str(chosen), str(out_path))
+        os.replace(chosen, out_path)
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
@@ -521,17 +682,11 @@ def export_bom(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any], ve
     if res.code == 0 and out_path.exists():
         # Post-check: warn if required columns are missing from header
         try:
-            import csv  # local import to avoid top-level dependency in non-BOM runs
             with out_path.open("r", encoding="utf-8-sig", newline="") as f:
-                # Attempt to detect delimiter
-                sample = f.read(2048)
-                f.seek(0)
-                try:
-                    dialect = csv.Sniffer().sniff(sample, delimiters=[",", "\t", ";"])
-                except Exception:
-                    class _Dial: pass
-                    dialect = _Dial(); setattr(dialect, "delimiter", ",")
-                reader = csv.reader(f, delimiter=getattr(dialect, "delimiter", ","))
+                # Delimiter follows the --format-preset we just requested;
+                # no need to sniff it back out of the file
+                delim = "\t" if fmt == "tsv" else ","
+                reader = csv.reader(f, delimiter=delim)
                 header = next(reader, [])
                 header_set = set(h.strip() for h in header)
                 for missing_col in ["Supplier", "Supplier Part Number"]:
@@ -545,6 +700,241 @@ def export_bom(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any], ve
     raise RuntimeError(f"BOM export failed: {res.err or res.out}")
 
 
+def _cli_version_info(version: str) -> Tuple[int, int]:
+    """Extract (major, minor) from a kicad-cli --version line; (0, 0) if unparseable."""
+    m = re.search(r"(\d+)\.(\d+)", version or "")
+    if not m:
+        return (0, 0)
+    return int(m.group(1)), int(m.group(2))
+
+
+def export_pcb_jobset(kicad: str, proj: Project, out_dir: Path, config: Dict[str, Any],
+                      zip_gerbers: bool, verbose: bool) -> Optional[Dict[str, str]]:
+    """Run the pcb-side exports (gerbers, drill, STEP, PCB PDF) as one jobset.
+
+    Each kicad-cli invocation reloads and reparses the board file; batching
+    the pcb exports into a single `jobset run` loads the board once. Returns
+    the produced outputs, or None when the jobset run fails or does not
+    produce the expected artifacts so the caller can fall back to per-export
+    invocations.
+
+    Opt-in via general.engine=jobset: KiCad's job deserializer silently
+    substitutes defaults for settings keys it does not recognize, and the
+    verification here only confirms artifacts exist, not that every
+    configured option took effect. Check the outputs against your config
+    before enabling this in CI.
+    """
+    g_cfg = config.get("gerbers", {})
+    s_cfg = config.get("step", {})
+    p_cfg = config.get("pcb_pdf", {})
+
+    jobs: List[Dict[str, Any]] = []
+    out_map: Dict[str, List[str]] = {}  # destination folder -> job ids
+
+    def _job(job_type: str, settings: Dict[str, Any], dest: Path) -> None:
+        jid = str(uuid.uuid4())
+        jobs.append({"description": "", "id": jid, "settings": settings, "type": job_type})
+        out_map.setdefault(str(dest), []).append(jid)
+
+    g_dir = out_dir / "gerbers"
+    if g_cfg.get("enabled", True):
+        g_dir.mkdir(parents=True, exist_ok=True)
+        _job("pcb_export_gerbers", {"layers": list(g_cfg.get("layers") or [])}, g_dir)
+        d_cfg = g_cfg.get("drill", {})
+        if d_cfg.get("enabled", True):
+            units = d_cfg.get("units")
+            d_settings: Dict[str, Any] = {
+                "units": "in" if units in {"inch", "in"} else "mm",
+                "excellon_separate_th": d_cfg.get("merge_npth") is False,
+            }
+            map_fmt = d_cfg.get("map_format")
+            if map_fmt:
+                mf = str(map_fmt).lower()
+                d_settings["generate_map"] = True
+                d_settings["map_format"] = "gerberx2" if mf == "gerber" else mf
+            _job("pcb_export_drill", d_settings, g_dir)
+
+    step_path = out_dir / f"{FBASE}.step"
+    if s_cfg.get("enabled", True):
+        s_settings: Dict[str, Any] = {"output_filename": step_path.name}
+        for flag in ("include_tracks_zones", "include_pads", "include_inner_copper",
+                     "include_silkscreen", "include_soldermask", "board_only", "fuse_shapes"):
+            if s_cfg.get(flag):
+                s_settings[flag] = True
+        _job("pcb_export_step", s_settings, out_dir)
+
+    pdf_path = out_dir / f"{FBASE}_PCB.pdf"
+    if p_cfg.get("enabled", True):
+        p_settings: Dict[str, Any] = {
+            "output_filename": pdf_path.name,
+            "layers": list(p_cfg.get("layers") or []),
+            "black_and_white": bool(p_cfg.get("monochrome")),
+            "include_border_title": p_cfg.get("include_title_block", True),
+            "mode": "multipage",
+        }
+        _job("pcb_export_pdf", p_settings, out_dir)
+
+    if not jobs:
+        return {}
+
+    zip_path = out_dir / f"{FBASE}_gerbers.zip"
+
+    def _discard_partial() -> None:
+        # The per-export fallback re-exports into the same locations and
+        # make_zip archives everything in g_dir, so nothing from a failed
+        # (possibly mis-parameterized) batch attempt may be left behind
+        if g_cfg.get("enabled", True):
+            shutil.rmtree(g_dir, ignore_errors=True)
+            g_dir.mkdir(parents=True, exist_ok=True)
+            zip_path.unlink(missing_ok=True)
+        step_path.unlink(missing_ok=True)
+        pdf_path.unlink(missing_ok=True)
+
+    jobset = {
+        "jobs": jobs,
+        "meta": {"version": 1},
+        "outputs": [
+            {"description": "", "id": str(uuid.uuid4()), "only": ids,
+             "settings": {"output_path": dest}, "type": "folder"}
+            for dest, ids in out_map.items()
+        ],
+    }
+    js_path = out_dir / f"{FBASE}.kicad_jobset"
+    with js_path.open("w", encoding="utf-8") as f:
+        json.dump(jobset, f, indent=2)
+
+    try:
+        res = run([kicad, "jobset", "run", "--file", str(js_path), str(proj.pro)], verbose=verbose)
+    finally:
+        js_path.unlink(missing_ok=True)
+    if res.code != 0:
+        _discard_partial()
+        return None
+
+    # Verify everything the jobs promised actually landed; anything missing
+    # means a schema/version mismatch and the per-export path should run.
+    outputs: Dict[str, str] = {}
+    if g_cfg.get("enabled", True):
+        if not any(g_dir.iterdir()):
+            _discard_partial()
+            return None
+        if zip_gerbers:
+            make_zip(zip_path, g_dir)
+            outputs["gerbers_zip"] = str(zip_path)
+    if s_cfg.get("enabled", True):
+        if not step_path.exists():
+            _discard_partial()
+            return None
+        outputs["step"] = str(step_path)
+    if p_cfg.get("enabled", True):
+        if not pdf_path.exists():
+            _discard_partial()
+            return None
+        outputs["pcb_pdf"] = str(pdf_path)
+    return outputs
+
+
+_WORKER_SCRIPT = Path(__file__).with_name("_kicad_worker.py")
+
+
+def export_pcb_pcbnew(proj: Project, out_dir: Path, config: Dict[str, Any],
+                      zip_gerbers: bool, verbose: bool) -> Optional[Dict[str, str]]:
+    """Run gerber and drill export in a single pcbnew worker process.
+
+    One interpreter imports pcbnew and loads the board once, instead of
+    paying kicad-cli's cold start per export. The worker streams JSON lines
+    on stdout; jobs it cannot handle (STEP, multipage PDF) are skipped here
+    and exported through kicad-cli by the caller. Returns the produced
+    outputs, or None when the worker is unavailable or the gerber/drill jobs
+    did not complete.
+    """
+    g_cfg = config.get("gerbers", {})
+    if not g_cfg.get("enabled", True):
+        return {}
+
+    g_dir = out_dir / "gerbers"
+    g_dir.mkdir(parents=True, exist_ok=True)
+
+    def _discard_partial() -> None:
+        # The kicad-cli fallback re-exports into g_dir and make_zip archives
+        # everything there; leave no files from a failed worker attempt
+        shutil.rmtree(g_dir, ignore_errors=True)
+        g_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs: List[Dict[str, Any]] = [
+        {"type": "gerbers", "out_dir": str(g_dir), "layers": list(g_cfg.get("layers") or [])},
+    ]
+    d_cfg = g_cfg.get("drill", {})
+    if d_cfg.get("enabled", True):
+        jobs.append({
+            "type": "drill",
+            "out_dir": str(g_dir),
+            "units": str(d_cfg.get("units", "mm")),
+            "merge_npth": bool(d_cfg.get("merge_npth", False)),
+            # empty string disables map generation
+            "map_format": str(d_cfg.get("map_format") or "").lower(),
+        })
+
+    spec_path = out_dir / "_worker_spec.json"
+    with spec_path.open("w", encoding="utf-8") as f:
+        json.dump({"pcb": str(proj.pcb), "jobs": jobs}, f)
+
+    python_exe = config.get("general", {}).get("pcbnew_python") or sys.executable
+    cmd = [python_exe, str(_WORKER_SCRIPT), str(spec_path)]
+    if verbose:
+        print("$", " ".join(cmd))
+    # The JSON-line protocol must arrive intact, so the worker bypasses
+    # run()'s tail-truncating capture; a single 'done' event can exceed the
+    # tail window on high layer-count boards. Only the INVOKED previews are
+    # trimmed.
+    try:
+        p = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except FileNotFoundError as e:
+        with _INVOKED_LOCK:
+            INVOKED.append({
+                "cmd": cmd,
+                "cwd": None,
+                "code": 127,
+                "stdout_preview": "",
+                "stderr_preview": str(e)[:500],
+            })
+        _discard_partial()
+        return None
+    finally:
+        spec_path.unlink(missing_ok=True)
+    worker_out = p.stdout or ""
+    with _INVOKED_LOCK:
+        INVOKED.append({
+            "cmd": cmd,
+            "cwd": None,
+            "code": p.returncode,
+            "stdout_preview": worker_out.strip()[:500],
+            "stderr_preview": (p.stderr or "").strip()[:500],
+        })
+    if p.returncode != 0:
+        _discard_partial()
+        return None
+
+    done = set()
+    for line in worker_out.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("event") == "done":
+            done.add(event.get("job"))
+    if "gerbers" not in done or (d_cfg.get("enabled", True) and "drill" not in done):
+        _discard_partial()
+        return None
+
+    outputs: Dict[str, str] = {}
+    if zip_gerbers:
+        zip_path = out_dir / f"{FBASE}_gerbers.zip"
+        make_zip(zip_path, g_dir)
+        outputs["gerbers_zip"] = str(zip_path)
+    return outputs
+
+
 def export_pos(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any], verbose: bool) -> Dict[str, str]:
     """Export component position (pick-and-place) files.
 
@@ -604,13 +994,19 @@ def export_pos(kicad: str, proj: Project, out_dir: Path, cfg: Dict[str, Any], ve
 # Zip helper
 # -----------------------------
 
-def make_zip(zip_path: Path, src_dir: Path) -> None:
-    import zipfile
+# Already-compressed formats gain nothing from deflate; store them as-is
+_ZIP_STORED_SUFFIXES = {".zip", ".pdf", ".png", ".jpg", ".jpeg", ".gz"}
+
 
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for p in sorted(src_dir.rglob("*")):
-            if p.is_file():
-                arc = p.relative_to(src_dir)
+def make_zip(zip_path: Path, src_dir: Path) -> None:
+    # Gerber/drill output is highly compressible text: deflate level 1 is
+    # nearly as small as the default level 6 but roughly 3x faster.
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for p in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+            arc = p.relative_to(src_dir)
+            if p.suffix.lower() in _ZIP_STORED_SUFFIXES:
+                zf.write(p, arcname=str(arc), compress_type=zipfile.ZIP_STORED)
+            else:
                 zf.write(p, arcname=str(arc))
 
 
@@ -618,10 +1014,15 @@ def make_zip(zip_path: Path, src_dir: Path) -> None:
 # Manifest
 # -----------------------------
 
-def write_manifest(out_dir: Path, data: Dict[str, Any]) -> Path:
+def write_manifest(out_dir: Path, data: Dict[str, Any], compact: bool = False) -> Path:
     man_path = out_dir / "manifest.json"
     with man_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        if compact:
+            # CI runs accumulate many INVOKED entries; compact separators and
+            # no indentation keep the file small and the encoder fast
+            json.dump(data, f, separators=(",", ":"))
+        else:
+            json.dump(data, f, indent=2)
     return man_path
 
 
@@ -634,7 +1035,78 @@ NAME_FOR_FILES = ""
 FBASE = ""  # {safe_name}_{tag_safe}
 
 
-def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+# The option shape is fixed, so the common CI invocation can be parsed with a
+# simple loop instead of paying argparse's import and setup cost on startup.
+_ARG_DEFAULTS: Dict[str, Any] = {
+    "project_dir": None,
+    "project_name": None,
+    "tag": None,
+    "config": None,
+    "out_dir": None,
+    "color": False,
+    "monochrome": False,
+    "verbose": False,
+    "quiet": False,
+}
+_VALUE_OPTS = {
+    "--project-dir": "project_dir",
+    "--project-name": "project_name",
+    "--tag": "tag",
+    "--config": "config",
+    "--out-dir": "out_dir",
+}
+_FLAG_OPTS = {
+    "--color": "color",
+    "--monochrome": "monochrome",
+    "--verbose": "verbose",
+    "--quiet": "quiet",
+}
+
+
+def _fast_parse(argv: List[str]) -> Optional[types.SimpleNamespace]:
+    """Parse the known option shape without argparse; None means fall back.
+
+    Anything unrecognized (including --help) or invalid (missing value,
+    mutually exclusive pair) returns None so the argparse path can produce
+    its usual diagnostics.
+    """
+    ns = types.SimpleNamespace(**_ARG_DEFAULTS)
+    i = 0
+    while i < len(argv):
+        a = argv[i]
+        if a in _VALUE_OPTS:
+            # A following option token means the value is missing; let
+            # argparse report it ("expected one argument")
+            if i + 1 >= len(argv) or argv[i + 1].startswith("--"):
+                return None
+            setattr(ns, _VALUE_OPTS[a], argv[i + 1])
+            i += 2
+            continue
+        key, sep, val = a.partition("=")
+        if sep and key in _VALUE_OPTS:
+            setattr(ns, _VALUE_OPTS[key], val)
+            i += 1
+            continue
+        if a in _FLAG_OPTS:
+            setattr(ns, _FLAG_OPTS[a], True)
+            i += 1
+            continue
+        return None
+    if not ns.project_dir:
+        return None
+    if (ns.color and ns.monochrome) or (ns.verbose and ns.quiet):
+        return None
+    return ns
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Any:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    ns = _fast_parse(argv)
+    if ns is not None:
+        return ns
+
+    import argparse  # deferred: only needed for --help and error reporting
+
     p = argparse.ArgumentParser(description="Export KiCad project artifacts using kicad-cli")
     p.add_argument("--project-dir", required=True, help="Path to folder containing .kicad_pro")
     p.add_argument("--project-name", help="Basename of KiCad project without extension (disambiguate if multiple)")
@@ -661,8 +1133,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     TAG = tag
     TAG_SAFE = _sanitize_label(tag)
 
-    # Load config
-    config: Dict[str, Any] = json.loads(json.dumps(DEFAULT_CONFIG))  # deep copy
+    # Load config. DEFAULT_CONFIG is treated as read-only: all overrides
+    # (YAML file, CLI color flags) are gathered first and merged
+    # copy-on-write, so the common no-override run shares the defaults
+    # without copying anything.
+    overrides: Dict[str, Any] = {}
     if args.config:
         cfg_path = Path(args.config)
         if not cfg_path.exists():
@@ -672,19 +1147,22 @@ def main(argv: Optional[List[str]] = None) -> int:
             print("PyYAML not installed. Install with 'pip install pyyaml' or omit --config.", file=sys.stderr)
             return 2
         with cfg_path.open("r", encoding="utf-8") as f:
-            user_cfg = yaml.safe_load(f) or {}
+            # Prefer the libyaml-backed loader when available; same safe
+            # semantics, several times faster on large configs
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            user_cfg = yaml.load(f, Loader=loader) or {}
         if not isinstance(user_cfg, dict):
             print("Config file must contain a YAML mapping at the root.", file=sys.stderr)
             return 2
-        _deep_update(config, user_cfg)
+        overrides = user_cfg
 
-    # Apply CLI color overrides for PDF outputs
-    if getattr(args, "color", False):
-        config.setdefault("pcb_pdf", {}).update({"monochrome": False})
-        config.setdefault("schematics_pdf", {}).update({"monochrome": False})
-    elif getattr(args, "monochrome", False):
-        config.setdefault("pcb_pdf", {}).update({"monochrome": True})
-        config.setdefault("schematics_pdf", {}).update({"monochrome": True})
+    # CLI color overrides for PDF outputs
+    if getattr(args, "color", False) or getattr(args, "monochrome", False):
+        mono = bool(getattr(args, "monochrome", False))
+        for section in ("pcb_pdf", "schematics_pdf"):
+            overrides.setdefault(section, {})["monochrome"] = mono
+
+    config: Dict[str, Any] = _cow_merge(DEFAULT_CONFIG, overrides)
 
     verbose = bool(args.verbose)
     quiet = bool(args.quiet)
@@ -707,11 +1185,16 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     # Clean output if requested
     if config.get("general", {}).get("clean_output", True):
-        for child in out_dir.iterdir():
-            if child.is_file():
-                child.unlink(missing_ok=True)
-            elif child.is_dir():
-                shutil.rmtree(child, ignore_errors=True)
+        # scandir reuses the d_type from the directory read; iterdir with
+        # is_file()/is_dir() would stat each entry twice
+        with os.scandir(out_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    # files and symlinks, including dangling ones; tolerate
+                    # entries removed concurrently
+                    Path(entry.path).unlink(missing_ok=True)
 
     # Find kicad-cli
     try:
@@ -728,34 +1211,98 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     outputs: Dict[str, str] = {}
 
-    # Export sequence
-    try:
+    # Export tasks. Each is an independent kicad-cli process reading the
+    # board/schematic and writing to distinct files under out_dir, so they can
+    # run concurrently; wall clock approaches the slowest single exporter.
+    tasks: List[Tuple[str, Callable[[], Dict[str, str]]]] = []
+
+    def _task_gerbers() -> Dict[str, str]:
         gz = export_gerbers_and_drill(
             kicad_cli_path, proj, out_dir, config.get("gerbers", {}),
             zip_gerbers=config.get("general", {}).get("zip_gerbers", True),
             verbose=verbose,
         )
-        if gz is not None:
-            outputs["gerbers_zip"] = str(gz)
+        return {"gerbers_zip": str(gz)} if gz is not None else {}
+
+    def _task_step() -> Dict[str, str]:
+        return {"step": str(export_step(kicad_cli_path, proj, out_dir, config.get("step", {}), verbose))}
+
+    def _task_pcb_pdf() -> Dict[str, str]:
+        return {"pcb_pdf": str(export_pcb_pdf(kicad_cli_path, proj, out_dir, config.get("pcb_pdf", {}), verbose))}
+
+    def _task_sch_pdf() -> Dict[str, str]:
+        return {"schematics_pdf": str(export_sch_pdf(kicad_cli_path, proj, out_dir, config.get("schematics_pdf", {}), verbose))}
+
+    def _task_bom() -> Dict[str, str]:
+        return {"bom_csv": str(export_bom(kicad_cli_path, proj, out_dir, config.get("bom", {}), verbose))}
+
+    def _task_pos() -> Dict[str, str]:
+        return export_pos(kicad_cli_path, proj, out_dir, config.get("pos", {}), verbose)
+
+    # Batch engines amortize the per-spawn board load: the pcbnew worker runs
+    # gerbers+drill in one interpreter, the KiCad 9 jobset runner executes
+    # all pcb exports against one loaded board. Both are opt-in and fall
+    # back to per-export kicad-cli invocations when unavailable or
+    # unsuccessful.
+    engine = str(config.get("general", {}).get("engine", "cli")).lower()
+    zip_gerbers = config.get("general", {}).get("zip_gerbers", True)
+    worker_batch: Optional[Dict[str, str]] = None  # covers gerbers+drill
+    pcb_batch: Optional[Dict[str, str]] = None     # covers gerbers/step/pcb_pdf
+    if engine == "pcbnew":
+        worker_batch = export_pcb_pcbnew(proj, out_dir, config, zip_gerbers=zip_gerbers, verbose=verbose)
+        if worker_batch is None and verbose:
+            print("pcbnew worker unavailable; using kicad-cli")
+    if worker_batch is None and engine == "jobset" and _cli_version_info(kicad_cli_version) >= (8, 99):
+        pcb_batch = export_pcb_jobset(
+            kicad_cli_path, proj, out_dir, config,
+            zip_gerbers=zip_gerbers,
+            verbose=verbose,
+        )
+        if pcb_batch is None and verbose:
+            print("jobset batch export unavailable; using per-export invocations")
 
+    if pcb_batch is None:
+        if worker_batch is None and config.get("gerbers", {}).get("enabled", True):
+            tasks.append(("gerbers", _task_gerbers))
         if config.get("step", {}).get("enabled", True):
-            s = export_step(kicad_cli_path, proj, out_dir, config.get("step", {}), verbose)
-            outputs["step"] = str(s)
+            tasks.append(("step", _task_step))
         if config.get("pcb_pdf", {}).get("enabled", True):
-            ppdf = export_pcb_pdf(kicad_cli_path, proj, out_dir, config.get("pcb_pdf", {}), verbose)
-            outputs["pcb_pdf"] = str(ppdf)
-        if config.get("schematics_pdf", {}).get("enabled", True):
-            spdf = export_sch_pdf(kicad_cli_path, proj, out_dir, config.get("schematics_pdf", {}), verbose)
-            outputs["schematics_pdf"] = str(spdf)
-        if config.get("bom", {}).get("enabled", True):
-            b = export_bom(kicad_cli_path, proj, out_dir, config.get("bom", {}), verbose)
-            outputs["bom_csv"] = str(b)
-        # Component position (pick-and-place) files
-        if config.get("pos", {}).get("enabled", True):
-            pos_outs = export_pos(kicad_cli_path, proj, out_dir, config.get("pos", {}), verbose)
-            outputs.update(pos_outs)
-    except RuntimeError as e:
-        print(str(e), file=sys.stderr)
+            tasks.append(("pcb_pdf", _task_pcb_pdf))
+    if config.get("schematics_pdf", {}).get("enabled", True):
+        tasks.append(("schematics_pdf", _task_sch_pdf))
+    if config.get("bom", {}).get("enabled", True):
+        tasks.append(("bom", _task_bom))
+    if config.get("pos", {}).get("enabled", True):
+        tasks.append(("pos", _task_pos))
+
+    fail_fast = bool(config.get("general", {}).get("fail_fast", True))
+    results: Dict[str, Dict[str, str]] = {}
+    errors: List[str] = []
+    if tasks:
+        max_workers = min(len(tasks), os.cpu_count() or 4)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(fn): label for label, fn in tasks}
+            for fut in concurrent.futures.as_completed(futures):
+                label = futures[fut]
+                try:
+                    results[label] = fut.result()
+                except concurrent.futures.CancelledError:
+                    continue
+                except RuntimeError as e:
+                    errors.append(str(e))
+                    if fail_fast:
+                        ex.shutdown(wait=False, cancel_futures=True)
+                        break
+    # Merge results in task order so the manifest is stable across runs
+    if worker_batch:
+        outputs.update(worker_batch)
+    if pcb_batch:
+        outputs.update(pcb_batch)
+    for label, _fn in tasks:
+        outputs.update(results.get(label, {}))
+    if errors:
+        for e in errors:
+            print(e, file=sys.stderr)
         return 1
 
     # Manifest
@@ -785,7 +1332,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         "outputs_dir": str(out_dir),
         "invoked_commands": INVOKED,
     }
-    man_path = write_manifest(out_dir, manifest)
+    man_path = write_manifest(out_dir, manifest, compact=quiet)
 
     if not quiet:
         print("Artifacts:")